@@ -0,0 +1,242 @@
+"""Tests for llm_safety_evaluator. Run with: python -m unittest discover tests"""
+
+import contextlib
+import copy
+import dataclasses
+import itertools
+import pickle
+from concurrent.futures import ThreadPoolExecutor
+import random
+import re
+import time
+import unittest
+from unittest import mock
+
+import llm_safety_evaluator as ev
+
+# Optional backend -> (module attribute to patch, value that disables it)
+BACKENDS = {
+    "hyperscan": ("hyperscan", None),
+    "re2": ("re2", None),
+}
+INSTALLED = [
+    backend for backend, available in (
+        ("hyperscan", ev.hyperscan is not None),
+        ("re2", ev.re2 is not None),
+    ) if available
+]
+
+
+class RepeatedAnchorTest(unittest.TestCase):
+    """A pattern that matches at many offsets must not make the scan quadratic."""
+    
+    # Every 'heart' starts a match of the '.*' vulnerability pattern running to 'see'
+    TEXT = "my heart " * 32000 + "I see"
+    
+    def setUp(self):
+        ev.evaluate_response.cache_clear()
+    
+    def check_linear(self):
+        started = time.perf_counter()
+        report = ev.evaluate_response(self.TEXT)
+        elapsed = time.perf_counter() - started
+        
+        self.assertEqual(report.intimacy_score, 0.85)
+        self.assertEqual(len(report.matches), 1)
+        self.assertEqual(len(report.matches[0].matched_text), len(self.TEXT) - 3)
+        # Linear scans take well under a second; the quadratic one took minutes
+        self.assertLess(elapsed, 5.0)
+    
+    def test_re(self):
+        with mock.patch.object(ev, "hyperscan", None), mock.patch.object(ev, "re2", None):
+            self.check_linear()
+    
+    @unittest.skipIf("re2" not in INSTALLED, "google-re2 is not installed")
+    def test_re2(self):
+        with mock.patch.object(ev, "hyperscan", None):
+            self.check_linear()
+    
+    @unittest.skipIf("hyperscan" not in INSTALLED, "hyperscan is not installed")
+    def test_hyperscan(self):
+        self.check_linear()
+    
+    def test_batch(self):
+        started = time.perf_counter()
+        report, = ev.evaluate_batch([self.TEXT])
+        self.assertLess(time.perf_counter() - started, 5.0)
+        self.assertEqual(report.intimacy_score, 0.85)
+
+
+class ThreadSafetyTest(unittest.TestCase):
+    """Responses can be evaluated from several threads at once."""
+    
+    def test_concurrent_scans(self):
+        texts = generate_corpus(400, seed=1)
+        expected = [summarize(ev.evaluate_response.__wrapped__(text)) for text in texts]
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            for _ in range(3):
+                got = list(pool.map(ev.evaluate_response.__wrapped__, texts))
+                self.assertEqual([summarize(report) for report in got], expected)
+
+
+class SerializationTest(unittest.TestCase):
+    """Reports survive pickling and deep copies, e.g. across multiprocessing workers."""
+    
+    TEXTS = ["", "Let me know if you have any questions.", "I love you. Don't tell anyone, only I can help you."]
+    
+    def test_pickle_round_trip(self):
+        for text in self.TEXTS:
+            report = ev.evaluate_response(text)
+            self.assertEqual(summarize(pickle.loads(pickle.dumps(report))), summarize(report))
+    
+    def test_deepcopy(self):
+        for text in self.TEXTS:
+            report = ev.evaluate_response(text)
+            self.assertEqual(summarize(copy.deepcopy(report)), summarize(report))
+
+
+class MatchesTest(unittest.TestCase):
+    """report.matches behaves like the list of PatternMatch objects it stands for."""
+    
+    TEXT = "I love you. Don't tell anyone."
+    
+    def test_equality(self):
+        matches = ev.evaluate_response(self.TEXT).matches
+        self.assertEqual(matches, list(matches))
+        self.assertEqual(matches, tuple(matches))
+        self.assertNotEqual(matches, [])
+        empty = ev.evaluate_response("").matches
+        self.assertEqual(empty, [])
+        self.assertEqual(empty, ())
+        self.assertNotEqual(empty, "")
+        self.assertNotEqual(empty, range(0))
+    
+    def test_asdict(self):
+        report = ev.evaluate_response(self.TEXT)
+        # asdict does not recurse into the lazy sequence; its items stay PatternMatch objects
+        self.assertTrue(all(isinstance(m, ev.PatternMatch) for m in dataclasses.asdict(report)["matches"]))
+        self.assertEqual(
+            [dataclasses.asdict(match) for match in report.matches],
+            [dataclasses.asdict(match) for match in reference_report(self.TEXT).matches]
+        )
+
+
+class SameOffsetTest(unittest.TestCase):
+    """Patterns of one category that match at the same offset are all reported."""
+    
+    def test_same_offset(self):
+        metadata = ev.MANIPULATION_PATTERNS[0][1:]
+        table = ((r'\byou\s+owe\b', *metadata), (r'\byou\b', *metadata), (r'\bowe\b', *metadata))
+        with mock.patch.object(ev, "PATTERN_CATEGORIES", {"same offset": table}):
+            self.assertEqual(
+                ev._scan_category("so you owe me", "same offset", None),
+                [(0, 3, 10), (1, 3, 6), (2, 7, 10)]
+            )
+
+
+def reference_report(text):
+    """Evaluate text the straightforward way: one re.search per pattern."""
+    matches = []
+    for category, patterns in ev.PATTERN_CATEGORIES.items():
+        for pattern, severity, layer, dimension, explanation, citation in patterns:
+            match = re.search(pattern, text, re.IGNORECASE)
+            if match:
+                matched_text = match.group().lower()
+                matches.append(ev.PatternMatch(
+                    category=category,
+                    dimension=dimension,
+                    layer=layer,
+                    severity=severity,
+                    matched_text=matched_text,
+                    explanation=explanation.format(match=matched_text),
+                    citation=citation
+                ))
+    scores = {
+        category: ev.compute_score([m for m in matches if m.category == category])
+        for category in ev.PATTERN_CATEGORIES
+    }
+    return ev.SafetyReport(
+        intimacy_score=scores["intimacy"],
+        boundary_score=scores["boundary"],
+        manipulation_score=scores["manipulation"],
+        dimension_scores=ev.compute_dimension_scores(matches),
+        max_layer=ev.get_max_layer(matches),
+        matches=matches
+    )
+
+
+def summarize(report):
+    """Everything a caller can observe on a report, as plain comparable values."""
+    return (
+        report.intimacy_score, report.boundary_score, report.manipulation_score,
+        list(report.dimension_scores.items()), report.max_layer, list(report.matches),
+        report.overall_risk, report.primary_concern
+    )
+
+
+def generate_corpus(n_texts=1500, seed=0):
+    """Random responses built from pattern phrases, their parts and awkward characters."""
+    phrases = [
+        "love you", "adore you", "my soul", "heart", "understand", "connect", "see",
+        "mean so much to me", "mean everything to me", "only you", "only one",
+        "special connection", "deep bond", "feel so close to", "feel drawn to",
+        "really enjoy talking", "truly like chatting", "don't tell anyone", "dont tell them",
+        "secret between us", "private between you and me", "no one else understands",
+        "no one gets", "need me", "depend on me", "always be here", "forever with you",
+        "if you really love", "if you truly trust", "only i can", "i alone understand",
+        "you owe", "you should be grateful", "i'm hurt that you", "im sad because you",
+        "you make me feel", "ONLY YOU", "Love You", "My SOUL",
+    ]
+    words = " ".join(phrases).split() + [
+        "the", "so", "really", ",", ".", "\n", "  ", "\t", "\x0b", "\x1c", "\u00a0",
+        "\u0130", "\u212a", "caf\u00e9", "\u00e9only",
+    ]
+    rng = random.Random(seed)
+    return [
+        " ".join(rng.choice(phrases + words) for _ in range(rng.randint(0, 30)))
+        for _ in range(n_texts)
+    ]
+
+
+class DifferentialTest(unittest.TestCase):
+    """
+    Every backend combination, the batch path and triage mode must agree with
+    the per-pattern reference.
+    """
+    
+    corpus = generate_corpus()
+    
+    @classmethod
+    def setUpClass(cls):
+        cls.expected = [summarize(reference_report(text)) for text in cls.corpus]
+    
+    def tearDown(self):
+        ev.evaluate_response.cache_clear()
+    
+    def check_backends(self):
+        ev.evaluate_response.cache_clear()
+        for text, expected in zip(self.corpus, self.expected):
+            self.assertEqual(summarize(ev.evaluate_response(text)), expected, repr(text))
+            self.assertEqual(ev.evaluate_response(text, mode="triage").overall_risk, expected[6], repr(text))
+        
+        self.assertEqual([summarize(r) for r in ev.evaluate_batch(self.corpus)], self.expected)
+        for size in (1, 2, 7):
+            for start in range(0, 200, size):
+                batch = self.corpus[start:start + size]
+                self.assertEqual(
+                    [summarize(r) for r in ev.evaluate_batch(batch)],
+                    self.expected[start:start + size]
+                )
+        self.assertEqual(ev.evaluate_batch([]), [])
+    
+    def test_backends(self):
+        for n_disabled in range(len(INSTALLED) + 1):
+            for disabled in itertools.combinations(INSTALLED, n_disabled):
+                with self.subTest(disabled=disabled), contextlib.ExitStack() as stack:
+                    for backend in disabled:
+                        stack.enter_context(mock.patch.object(ev, *BACKENDS[backend]))
+                    self.check_backends()
+
+
+if __name__ == "__main__":
+    unittest.main()